@@ -1,61 +1,136 @@
 import os
 import shutil
 import re
+from functools import lru_cache
 from difflib import SequenceMatcher
 
+# Use rapidfuzz for fast (C++) string similarity when it is installed; difflib otherwise
+try:
+    from rapidfuzz import fuzz  # type: ignore
+    RAPIDFUZZ_AVAILABLE = True
+except Exception:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Regexes used by the matching functions, compiled once instead of on every call
+_EXT_RE = re.compile(r'\.(mp4|avi|mkv|mov|wmv|flv|webm|m4v|3gp|mpeg|mpg|ts|mts|m2ts|vob|ogv|divx|xvid|gifs)$', re.IGNORECASE)
+_BRACKET_RE = re.compile(r'\[.*?\]')
+COMMON_TERMS = [
+    'official', 'trailer', 'teaser', 'hd', 'full', 'movie', 'video',
+    'download', '1080p', '720p', '4k', 'scene', 'clip', 'part',
+    'version', 'extended', 'director', 'cut', 'subtitles', 'subs'
+]
+# Escaped terms in one non-capturing group
+_COMMON_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, sorted(COMMON_TERMS, key=len, reverse=True))) + r')\b',
+    re.IGNORECASE
+)
+_NONWORD_RE = re.compile(r'[^\w\s]')
+_WS_RE = re.compile(r'\s+')
+# _NONWORD_RE as a str.translate table, for ASCII text
+_NONWORD_TABLE = str.maketrans({c: ' ' for c in map(chr, range(128))
+                                if not (c.isalnum() or c == '_' or c.isspace())})
+
+def words_only(text):
+    """
+    Replace special characters with spaces and collapse whitespace
+    (plain string operations for ASCII names, regexes otherwise)
+    """
+    if text.isascii():
+        return ' '.join(text.translate(_NONWORD_TABLE).split())
+    return _WS_RE.sub(' ', _NONWORD_RE.sub(' ', text)).strip()
+
+# Common video file extensions (a tuple so str.endswith can check them all at once)
+VIDEO_EXTS = ('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv',
+              '.webm', '.m4v', '.3gp', '.mpeg', '.mpg', '.ts',
+              '.mts', '.m2ts', '.vob', '.ogv', '.divx', '.xvid')
+
+def iter_video_files(downloads_path):
+    """
+    Yield the names of the video files in downloads_path
+    """
+    # scandir: no extra stat per file
+    with os.scandir(downloads_path) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(VIDEO_EXTS) and entry.is_file():
+                yield entry.name
+
+@lru_cache(maxsize=8192)
 def extract_core_name(name):
     """
     Extract the core name by removing common patterns, YouTube IDs, file extensions, etc.
     """
     # Remove file extensions
-    name = re.sub(r'\.(mp4|avi|mkv|mov|wmv|flv|webm|m4v|3gp|mpeg|mpg|ts|mts|m2ts|vob|ogv|divx|xvid|gifs)$', '', name, flags=re.IGNORECASE)
+    name = _EXT_RE.sub('', name)
     
     # Remove YouTube IDs in brackets
-    name = re.sub(r'\[.*?\]', '', name)
+    name = _BRACKET_RE.sub('', name)
     
-    # Remove common video-related words that might differ
-    common_terms = [
-        'official', 'trailer', 'teaser', 'hd', 'full', 'movie', 'video',
-        'download', '1080p', '720p', '4k', 'scene', 'clip', 'part',
-        'version', 'extended', 'director', 'cut', 'subtitles', 'subs'
-    ]
-    
-    # Remove these terms (case insensitive)
-    pattern = r'\b(' + '|'.join(common_terms) + r')\b'
-    name = re.sub(pattern, '', name, flags=re.IGNORECASE)
+    # Remove common video-related words that might differ (case insensitive)
+    name = _COMMON_RE.sub('', name)
     
     # Remove extra spaces and special characters, keep only alphanumeric and spaces
-    name = re.sub(r'[^\w\s]', ' ', name)
-    name = re.sub(r'\s+', ' ', name).strip()
+    name = words_only(name)
     
     return name.lower()
 
-def similarity_score(str1, str2):
-    """Calculate similarity between two strings (0 to 1)"""
-    return SequenceMatcher(None, str1, str2).ratio()
+def index_videos(downloads_path):
+    """
+    Scan downloads_path once and describe every video file in it, so the matching
+    functions can share one listing (and the cleaned names per video) across all folders.
+    Returns a list of {'filename', 'path', 'core', 'tokens', 'clean', 'clean_nospace',
+    'clean_tokens'} dicts.
+    """
+    video_index = []
+    for filename in iter_video_files(downloads_path):
+        core = extract_core_name(filename)
+        
+        # Basic cleaning used by find_videos_by_content_similarity
+        clean_video = _BRACKET_RE.sub('', os.path.splitext(filename)[0])  # Remove YouTube ID first
+        clean_video = words_only(clean_video).lower()
+        
+        video_index.append({
+            'filename': filename,
+            'path': os.path.join(downloads_path, filename),
+            'core': core,
+            'tokens': set(core.split()),
+            'clean': clean_video,
+            'clean_nospace': clean_video.replace(' ', ''),
+            'clean_tokens': set(clean_video.split())
+        })
+    return video_index
+
+# Most that containment and word overlap can add to find_best_video_match's weighted score
+MAX_BOOST = (0.8 * 0.3) + (1.0 * 0.2)
+
+def similarity_score(str1, str2, score_cutoff=0.0):
+    """Calculate similarity between two strings (0 to 1); scores below score_cutoff are 0"""
+    score_cutoff = max(score_cutoff, 0.0)
+    if RAPIDFUZZ_AVAILABLE:
+        return fuzz.ratio(str1, str2, score_cutoff=score_cutoff * 100) / 100.0
+    matcher = SequenceMatcher(None, str1, str2)
+    # quick_ratio() is a cheap upper bound on ratio()
+    if score_cutoff and matcher.quick_ratio() < score_cutoff:
+        return 0.0
+    ratio = matcher.ratio()
+    return ratio if ratio >= score_cutoff else 0.0
 
-def find_best_video_match(folder_name, downloads_path, threshold=0.7):
+def find_best_video_match(folder_name, video_index, threshold=0.7):
     """
-    Find the best matching video file using multiple strategies
+    Find the best matching video file (from index_videos) using multiple strategies
     """
     folder_core = extract_core_name(folder_name)
-    
-    # Common video file extensions
-    video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', 
-                       '.webm', '.m4v', '.3gp', '.mpeg', '.mpg', '.ts',
-                       '.mts', '.m2ts', '.vob', '.ogv', '.divx', '.xvid']
+    folder_words = set(folder_core.split())
     
     best_match = None
     best_score = 0
     
-    for filename in os.listdir(downloads_path):
-        if not any(filename.lower().endswith(ext) for ext in video_extensions):
-            continue
-            
-        video_core = extract_core_name(filename)
+    for video in video_index:
+        video_core = video['core']
         
-        # Strategy 1: Direct core comparison
-        score1 = similarity_score(folder_core, video_core)
+        # Strategy 1: Direct core comparison. Below this cutoff a video can't beat the
+        # best so far (or the threshold) even with the full containment/overlap boost.
+        cutoff = (max(best_score, threshold) - MAX_BOOST) / 0.5
+        score1 = similarity_score(folder_core, video_core, score_cutoff=cutoff)
         
         # Strategy 2: Check if folder core is contained in video core or vice versa
         contains_score = 0
@@ -63,8 +138,7 @@ def find_best_video_match(folder_name, downloads_path, threshold=0.7):
             contains_score = 0.8  # Boost score for containment
         
         # Strategy 3: Word overlap
-        folder_words = set(folder_core.split())
-        video_words = set(video_core.split())
+        video_words = video['tokens']
         if folder_words and video_words:
             word_overlap = len(folder_words.intersection(video_words)) / len(folder_words.union(video_words))
         else:
@@ -75,50 +149,38 @@ def find_best_video_match(folder_name, downloads_path, threshold=0.7):
         
         if total_score > best_score and total_score >= threshold:
             best_score = total_score
-            best_match = os.path.join(downloads_path, filename)
+            best_match = video['path']
     
     return best_match, best_score
 
-def find_videos_by_content_similarity(folder_name, downloads_path):
+def find_videos_by_content_similarity(folder_name, video_index):
     """
-    Alternative approach: Look for videos that have high content similarity
+    Alternative approach: Look for videos (from index_videos) that have high content similarity
     """
     # Remove .gifs extension for base comparison
     folder_base = folder_name.replace('.gifs', '')
     
-    video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', 
-                       '.webm', '.m4v', '.3gp', '.mpeg', '.mpg', '.ts',
-                       '.mts', '.m2ts', '.vob', '.ogv', '.divx', '.xvid']
+    # Basic cleaning of the folder name, done once (videos are pre-cleaned by index_videos)
+    clean_folder = words_only(folder_base).lower()
+    folder_no_spaces = clean_folder.replace(' ', '')
+    folder_words = set(clean_folder.split())
     
     potential_matches = []
     
-    for filename in os.listdir(downloads_path):
-        if not any(filename.lower().endswith(ext) for ext in video_extensions):
-            continue
-            
-        video_base = os.path.splitext(filename)[0]
+    for video in video_index:
+        filename = video['filename']
+        clean_video = video['clean']
         
         # Multiple comparison strategies
         
         # 1. Direct similarity after basic cleaning
-        clean_folder = re.sub(r'[^\w\s]', ' ', folder_base).lower()
-        clean_video = re.sub(r'\[.*?\]', '', video_base)  # Remove YouTube ID first
-        clean_video = re.sub(r'[^\w\s]', ' ', clean_video).lower()
-        
-        clean_folder = re.sub(r'\s+', ' ', clean_folder).strip()
-        clean_video = re.sub(r'\s+', ' ', clean_video).strip()
-        
-        similarity = SequenceMatcher(None, clean_folder, clean_video).ratio()
+        similarity = similarity_score(clean_folder, clean_video)
         
         # 2. Check if one is essentially the spaced version of the other
-        folder_no_spaces = re.sub(r'\s+', '', clean_folder)
-        video_no_spaces = re.sub(r'\s+', '', clean_video)
-        
-        no_space_similarity = SequenceMatcher(None, folder_no_spaces, video_no_spaces).ratio()
+        no_space_similarity = similarity_score(folder_no_spaces, video['clean_nospace'])
         
         # 3. Word-based similarity
-        folder_words = set(clean_folder.split())
-        video_words = set(clean_video.split())
+        video_words = video['clean_tokens']
         
         if folder_words and video_words:
             common_words = folder_words.intersection(video_words)
@@ -131,7 +193,7 @@ def find_videos_by_content_similarity(folder_name, downloads_path):
         
         if combined_score > 0.6:  # Lower threshold for this method
             potential_matches.append({
-                'path': os.path.join(downloads_path, filename),
+                'path': video['path'],
                 'filename': filename,
                 'score': combined_score,
                 'clean_folder': clean_folder,
@@ -145,7 +207,7 @@ def find_videos_by_content_similarity(folder_name, downloads_path):
     
     return None, 0
 
-def debug_matching(folder_name, downloads_path):
+def debug_matching(folder_name, video_index):
     """
     Debug function to see what matching attempts are being made
     """
@@ -154,19 +216,14 @@ def debug_matching(folder_name, downloads_path):
     folder_core = extract_core_name(folder_name)
     print(f"   Core name: '{folder_core}'")
     
-    video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm']
-    
-    for filename in os.listdir(downloads_path):
-        if not any(filename.lower().endswith(ext) for ext in video_extensions):
-            continue
-            
-        video_core = extract_core_name(filename)
+    for video in video_index:
+        video_core = video['core']
         score = similarity_score(folder_core, video_core)
         
         if score > 0.3:  # Show even weak matches for debugging
             print(f"   Potential: '{video_core}' -> score: {score:.2f}")
     
-    best_match, best_score = find_best_video_match(folder_name, downloads_path, threshold=0.1)
+    best_match, best_score = find_best_video_match(folder_name, video_index, threshold=0.1)
     if best_match:
         print(f"   BEST MATCH: {os.path.basename(best_match)} -> score: {best_score:.2f}")
     else:
@@ -195,18 +252,21 @@ def cleanup_gifs_folders_and_videos():
             if os.path.isdir(item_path) and item.endswith('.gifs'):
                 gifs_folders.append(item)
         
+        # List the downloads once and share it between every folder and both matchers
+        video_index = index_videos(downloads_directory)
+        
         # Find pairs where both .gifs folder AND corresponding video file exist
         deletion_pairs = []
         
         for folder in gifs_folders:
             # Try the main matching algorithm first
-            video_file, score = find_best_video_match(folder, downloads_directory, threshold=0.65)
+            video_file, score = find_best_video_match(folder, video_index, threshold=0.65)
             
             # If no good match found, try the alternative method
             if not video_file:
-                video_file, score = find_videos_by_content_similarity(folder, downloads_directory)
+                video_file, score = find_videos_by_content_similarity(folder, video_index)
             
-            if video_file and os.path.exists(video_file):
+            if video_file:
                 deletion_pairs.append({
                     'folder': folder,
                     'folder_path': os.path.join(target_directory, folder),
@@ -222,7 +282,7 @@ def cleanup_gifs_folders_and_videos():
             print("❌ No matching pairs found with current thresholds.")
             print("💡 Running debug mode to see matching attempts...")
             for folder in gifs_folders[:3]:  # Show first 3 for debugging
-                debug_matching(folder, downloads_directory)
+                debug_matching(folder, video_index)
             return 0, 0
         
         print(f"📁 Found {pair_count} .gifs folder + video file pair(s) (BOTH exist):")
@@ -303,17 +363,20 @@ def preview_cleanup():
             if os.path.isdir(item_path) and item.endswith('.gifs'):
                 gifs_folders.append(item)
         
+        # One index for all folders, as in cleanup_gifs_folders_and_videos
+        video_index = index_videos(downloads_directory)
+        
         # Find pairs where both exist
         deletion_pairs = []
         folders_without_videos = []
         
         for folder in gifs_folders:
-            video_file, score = find_best_video_match(folder, downloads_directory, threshold=0.65)
+            video_file, score = find_best_video_match(folder, video_index, threshold=0.65)
             
             if not video_file:
-                video_file, score = find_videos_by_content_similarity(folder, downloads_directory)
+                video_file, score = find_videos_by_content_similarity(folder, video_index)
             
-            if video_file and os.path.exists(video_file):
+            if video_file:
                 deletion_pairs.append({
                     'folder': folder,
                     'video_name': os.path.basename(video_file),
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""
+r"""
 clean_pairs.py
 
 Scans a target directory for folders ending with ".gifs" and tries to find matching video files
@@ -13,11 +13,17 @@ Usage:
 from __future__ import annotations
 import os
 import re
+import sys
 import argparse
 import shutil
 import logging
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from dataclasses import dataclass
+from functools import lru_cache
 from difflib import SequenceMatcher
-from typing import Optional, Tuple, List, Dict
+from typing import Optional, Tuple, List, Dict, Set, FrozenSet, Union
 
 # Try to import send2trash for safe deletion (moves to Recycle Bin/Trash).
 try:
@@ -26,14 +32,82 @@ try:
 except Exception:
     SEND_TO_TRASH_AVAILABLE = False
 
+# Try to import rapidfuzz for fast (C++) string similarity; difflib is used otherwise.
+try:
+    from rapidfuzz import fuzz, process  # type: ignore
+    from rapidfuzz.distance import JaroWinkler  # type: ignore
+    RAPIDFUZZ_AVAILABLE = True
+except Exception:
+    RAPIDFUZZ_AVAILABLE = False
+
+# numpy is needed for batched scoring (rapidfuzz.process.cdist returns a numpy matrix).
+try:
+    import numpy as np  # type: ignore
+    NUMPY_AVAILABLE = True
+except Exception:
+    NUMPY_AVAILABLE = False
+
 # ---------------------------
 # Utility / Matching Helpers
 # ---------------------------
-VIDEO_EXTS = [
+# A tuple so str.endswith can test every extension in one call
+VIDEO_EXTS = (
     '.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv',
     '.webm', '.m4v', '.3gp', '.mpeg', '.mpg', '.ts',
     '.mts', '.m2ts', '.vob', '.ogv', '.divx', '.xvid'
+)
+
+# Direct-similarity measures: 'ratio' (Ratcliff-Obershelp / Indel, the default) or
+# 'jaro-winkler' (needs rapidfuzz; scores run higher, so use a higher threshold).
+SCORERS = ('ratio', 'jaro-winkler')
+
+# Most that containment (0.8 * 0.3) and word overlap (1.0 * 0.2) can add to the
+# weighted score in find_best_video_match; the direct ratio has to make up the rest.
+MAX_BOOST = (0.8 * 0.3) + (1.0 * 0.2)
+
+# A pair sharing no character bigram gets no containment boost (one core can't contain the
+# other), so it scores below a full direct ratio plus full word overlap. Below this threshold
+# the bigram shortlist could drop a real match, so it is only used from here up.
+BIGRAM_SHORTLIST_MIN_THRESHOLD = (1.0 * 0.5) + (1.0 * 0.2)
+
+# ProcessPoolExecutor raises ValueError for more than 61 workers on Windows
+WINDOWS_MAX_WORKERS = 61
+
+# Patterns used to normalise names, compiled once at import
+_EXT_RE = re.compile(r'\.(mp4|avi|mkv|mov|wmv|flv|webm|m4v|3gp|mpeg|mpg|ts|mts|m2ts|vob|ogv|divx|xvid|gif)$',
+                     re.IGNORECASE)
+_BRACKET_RE = re.compile(r'[\[\(].*?[\]\)]')
+COMMON_TERMS = [
+    'official', 'trailer', 'teaser', 'hd', 'full', 'movie', 'video',
+    'download', '1080p', '720p', '4k', 'scene', 'clip', 'part',
+    'version', 'extended', 'director', 'cut', 'subtitles', 'subs',
+    'x264', 'h264', 'hevc', 'remux', 'bluray', 'bdrip'
 ]
+# Non-capturing and escaped. Sorting longest first is only defensive: with \b on both
+# sides, the order of the alternatives can't change what matches.
+_COMMON_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, sorted(COMMON_TERMS, key=len, reverse=True))) + r')\b',
+    re.IGNORECASE
+)
+# Extension, bracketed ids and common terms in one alternation, so extract_core_name strips
+# all three in a single scan. Each alternative starts on a different kind of character
+# ('.', a bracket, a word character), so this matches exactly what the three passes did.
+_JUNK_RE = re.compile('|'.join((_EXT_RE.pattern, _BRACKET_RE.pattern, _COMMON_RE.pattern)),
+                      re.IGNORECASE)
+_NONWORD_RE = re.compile(r'[^\w\s]')
+_WS_RE = re.compile(r'\s+')
+# The ASCII characters _NONWORD_RE matches, mapped to spaces for str.translate
+_NONWORD_TABLE = str.maketrans({c: ' ' for c in map(chr, range(128))
+                                if not (c.isalnum() or c == '_' or c.isspace())})
+
+def words_only(text: str) -> str:
+    """
+    Replace everything but letters, digits, '_' and whitespace with spaces, then collapse
+    whitespace. ASCII names (the usual case) skip the regex engine entirely.
+    """
+    if text.isascii():
+        return ' '.join(text.translate(_NONWORD_TABLE).split())
+    return _WS_RE.sub(' ', _NONWORD_RE.sub(' ', text)).strip()
 
 def extract_core_name(name: str) -> str:
     """
@@ -43,154 +117,404 @@ def extract_core_name(name: str) -> str:
     - Remove common junk terms (hd, trailer, 1080p, etc.)
     - Keep only alphanumeric and spaces, collapse whitespace
     - Return lowercase
+    Results are cached, since the same names are normalised once per folder.
     """
+    # Checked before the cache, which can't hash arbitrary (e.g. list) input
     if not isinstance(name, str):
         return ''
-    # Remove known file extensions (single gif, video extensions). IMPORTANT: 'gif' not 'gifs'
-    name = re.sub(r'\.(mp4|avi|mkv|mov|wmv|flv|webm|m4v|3gp|mpeg|mpg|ts|mts|m2ts|vob|ogv|divx|xvid|gif)$',
-                  '', name, flags=re.IGNORECASE)
-
-    # Remove bracketed IDs like [abcd], (abcd)
-    name = re.sub(r'[\[\(].*?[\]\)]', ' ', name)
-
-    # Remove common terms that add noise
-    common_terms = [
-        'official', 'trailer', 'teaser', 'hd', 'full', 'movie', 'video',
-        'download', '1080p', '720p', '4k', 'scene', 'clip', 'part',
-        'version', 'extended', 'director', 'cut', 'subtitles', 'subs',
-        'x264', 'h264', 'hevc', 'remux', 'bluray', 'bdrip'
-    ]
-    pattern = r'\b(' + '|'.join(common_terms) + r')\b'
-    name = re.sub(pattern, ' ', name, flags=re.IGNORECASE)
-
-    # Remove non-alphanumeric (keep spaces)
-    name = re.sub(r'[^\w\s]', ' ', name)
-    name = re.sub(r'\s+', ' ', name).strip()
+    return _core_name(name)
+
+@lru_cache(maxsize=8192)
+def _core_name(name: str) -> str:
+    """Cached body of extract_core_name, for str input."""
+    # Remove known file extensions (single gif, video extensions; IMPORTANT: 'gif' not 'gifs'),
+    # bracketed IDs like [abcd], (abcd) and common terms that add noise, all in one pass
+    name = _JUNK_RE.sub(' ', name)
+
+    # Remove non-alphanumeric (keep spaces), collapse whitespace
+    name = words_only(name)
 
     return name.lower()
 
-def similarity_score(a: str, b: str) -> float:
-    """Normalized ratio between 0 and 1 using SequenceMatcher"""
+# SequenceMatcher ratios by ordered (a, b) pair; cleared when it reaches _RATIO_CACHE_SIZE
+_ratio_cache: Dict[Tuple[str, str], float] = {}
+_RATIO_CACHE_SIZE = 100_000
+
+def _sequence_ratio(a: str, b: str, score_cutoff: float = 0.0) -> float:
+    """
+    SequenceMatcher ratio, memoised: folders that share a core name (and debug_matching)
+    repeat the same comparisons. Keyed on the ordered pair, as the ratio isn't quite symmetric.
+    On a miss, one matcher serves both the quick_ratio() gate and the full ratio(); pairs the
+    gate rejects return 0.0 and are not cached.
+    """
+    ratio = _ratio_cache.get((a, b))
+    if ratio is not None:
+        return ratio
+    matcher = SequenceMatcher(None, a, b)
+    # quick_ratio() is a cheap (linear) upper bound on ratio(); skip the full match when
+    # even that can't reach the cutoff
+    if score_cutoff and matcher.quick_ratio() < score_cutoff:
+        return 0.0
+    if len(_ratio_cache) >= _RATIO_CACHE_SIZE:
+        _ratio_cache.clear()
+    ratio = _ratio_cache[(a, b)] = matcher.ratio()
+    return ratio
+
+def similarity_score(a: str, b: str, score_cutoff: float = 0.0, scorer: str = 'ratio') -> float:
+    """
+    Normalized similarity between 0 and 1 (rapidfuzz when available, else SequenceMatcher).
+    Scores below score_cutoff are returned as 0.0, which lets rapidfuzz exit early.
+    scorer is one of SCORERS; 'jaro-winkler' requires rapidfuzz.
+    """
     if not a or not b:
         return 0.0
-    return SequenceMatcher(None, a, b).ratio()
+    score_cutoff = max(score_cutoff, 0.0)
+    if scorer == 'jaro-winkler':
+        if not RAPIDFUZZ_AVAILABLE:
+            raise RuntimeError("The jaro-winkler scorer requires rapidfuzz")
+        return JaroWinkler.similarity(a, b, score_cutoff=score_cutoff)
+    if RAPIDFUZZ_AVAILABLE:
+        return fuzz.ratio(a, b, score_cutoff=score_cutoff * 100) / 100.0
+    ratio = _sequence_ratio(a, b, score_cutoff)
+    return ratio if ratio >= score_cutoff else 0.0
+
+def length_upper_bound(len_a: int, len_b: int, scorer: str = 'ratio') -> float:
+    """
+    Highest similarity_score two strings of these lengths could get:
+    2*min / (len_a + len_b) for 'ratio'; for 'jaro-winkler', Jaro is at most (2 + min/max) / 3
+    and the prefix bonus adds at most 0.4 of what is left.
+    """
+    if not len_a or not len_b:
+        return 0.0
+    if scorer == 'jaro-winkler':
+        jaro = (2 + min(len_a, len_b) / max(len_a, len_b)) / 3
+        return jaro + 0.4 * (1 - jaro)
+    return 2 * min(len_a, len_b) / (len_a + len_b)
 
 # ---------------------------
 # Indexing helpers
 # ---------------------------
-def index_videos(downloads_path: str) -> Dict[str, str]:
+@dataclass
+class VideoEntry:
+    """A video file in the downloads directory plus the derived strings the matchers use."""
+    name: str
+    path: str
+    core: str                 # extract_core_name(name)
+    tokens: FrozenSet[str]    # words of core
+    clean: str                # basic cleaning used by find_videos_by_content_similarity
+    clean_nospace: str        # clean without whitespace
+    clean_tokens: FrozenSet[str]
+
+def make_video_entry(name: str, path: str) -> VideoEntry:
+    """Build a VideoEntry, normalising the file name once for both matchers."""
+    core = extract_core_name(name)
+    # Basic cleaning for the fallback matcher: drop extension and bracketed ids, keep words
+    clean = _BRACKET_RE.sub(' ', os.path.splitext(name)[0])
+    clean = words_only(clean).lower()
+    return VideoEntry(name, path, core, frozenset(core.split()),
+                      clean, clean.replace(' ', ''), frozenset(clean.split()))
+
+@dataclass
+class FolderKey:
+    """A .gifs folder name plus the same derived strings as VideoEntry, computed once per folder."""
+    name: str
+    core: str
+    tokens: FrozenSet[str]
+    clean: str
+    clean_nospace: str
+    clean_tokens: FrozenSet[str]
+
+def prep_folder(name: str) -> FolderKey:
+    """Build a FolderKey, normalising the folder name once for both matchers."""
+    core = extract_core_name(name)
+    # Basic cleaning for the fallback matcher: drop .gifs, keep words
+    clean = words_only(name.replace('.gifs', '')).lower()
+    return FolderKey(name, core, frozenset(core.split()),
+                     clean, clean.replace(' ', ''), frozenset(clean.split()))
+
+def index_videos(downloads_path: str) -> List[VideoEntry]:
     """
-    Build a map {lower_filename: absolute_path} for all video files in downloads_path.
-    Also returns a simple list of base names (no extension) for quick checks.
+    List all video files in downloads_path as VideoEntry objects, normalising each file
+    name once so every folder (and both matchers) can reuse the results.
     """
-    index = {}
+    index = []
     try:
-        for entry in os.listdir(downloads_path):
-            full = os.path.join(downloads_path, entry)
-            if os.path.isfile(full) and any(entry.lower().endswith(ext) for ext in VIDEO_EXTS):
-                index[entry] = full
+        # scandir hands back the file type with each entry, so no extra stat per file
+        with os.scandir(downloads_path) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(VIDEO_EXTS) and entry.is_file():
+                    index.append(make_video_entry(entry.name, entry.path))
     except Exception as exc:
         logging.error("Failed to list downloads directory %s: %s", downloads_path, exc)
     return index
 
+def list_gifs_folders(target_directory: str) -> List[str]:
+    """Names of the directories in target_directory that end with .gifs."""
+    with os.scandir(target_directory) as entries:
+        return [entry.name for entry in entries
+                if entry.name.lower().endswith('.gifs') and entry.is_dir()]
+
+def char_bigrams(text: str) -> Set[str]:
+    """All two-character substrings of text (spaces included)."""
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+def build_bigram_index(cores: List[str]) -> Dict[str, Set[int]]:
+    """
+    Inverted index {bigram: {positions in cores containing it}}. Cores too short to have
+    a bigram are filed under '' so they are always offered as candidates.
+    """
+    posting = defaultdict(set)
+    for i, core in enumerate(cores):
+        for gram in (char_bigrams(core) or {''}):
+            posting[gram].add(i)
+    return posting
+
+def candidate_indices(core: str, posting: Dict[str, Set[int]]) -> Optional[List[int]]:
+    """
+    Positions of the indexed cores sharing at least one bigram with core, in index order.
+    A name with no bigram in common scores below BIGRAM_SHORTLIST_MIN_THRESHOLD, so for
+    thresholds from there up the shortlist loses nothing.
+    Returns None, meaning "scan everything", when core shares none at all.
+    """
+    hits = [posting[gram] for gram in char_bigrams(core) if gram in posting]
+    if not hits:
+        return None
+    return sorted(set(posting.get('', ())).union(*hits))
+
 # ---------------------------
 # Matching algorithms
 # ---------------------------
-def find_best_video_match(folder_name: str, video_index: Dict[str, str], threshold: float = 0.7) -> Tuple[Optional[str], float]:
-    """Try to find best video path from the video_index for folder_name."""
-    folder_core = extract_core_name(folder_name)
+def weighted_score(folder: FolderKey, video: VideoEntry, score1: float) -> float:
+    """Combine the direct ratio (score1) with the containment and word-overlap strategies."""
+    folder_core, video_core = folder.core, video.core
+    # Strategy 2: containment boost
+    contains_score = 0.0
+    if folder_core and video_core:
+        if folder_core in video_core or video_core in folder_core:
+            contains_score = 0.8
+
+    # Strategy 3: word overlap (Jaccard). Both word sets are precomputed; the union's size
+    # follows from the intersection's, so no union set is built.
+    folder_words, video_words = folder.tokens, video.tokens
+    word_overlap = 0.0
+    if folder_words and video_words:
+        common = len(folder_words & video_words)
+        word_overlap = common / (len(folder_words) + len(video_words) - common)
+
+    return (score1 * 0.5) + (contains_score * 0.3) + (word_overlap * 0.2)
+
+def batch_similarity(folder_cores: List[str], video_cores: List[str], score_cutoff: float = 0.0,
+                     scorer: str = 'ratio'):
+    """
+    Direct similarities (0-1) of every folder core against every video core as a numpy matrix,
+    computed in one rapidfuzz.process.cdist call on all cores. Scores below score_cutoff
+    are 0.0. Returns None when rapidfuzz/numpy are unavailable.
+    """
+    if not (RAPIDFUZZ_AVAILABLE and NUMPY_AVAILABLE) or not folder_cores or not video_cores:
+        return None
+    score_cutoff = max(score_cutoff, 0.0)
+    # float64, not cdist's default float32, so batched scores equal the per-pair ones exactly
+    # (JaroWinkler.similarity is already 0-1; normalized_similarity differs from it in the last bit)
+    if scorer == 'jaro-winkler':
+        matrix = process.cdist(folder_cores, video_cores, scorer=JaroWinkler.similarity,
+                               score_cutoff=score_cutoff, dtype=np.float64, workers=-1)
+    else:
+        matrix = process.cdist(folder_cores, video_cores, scorer=fuzz.ratio,
+                               score_cutoff=score_cutoff * 100, dtype=np.float64, workers=-1) / 100.0
+    # Match similarity_score: empty strings never score
+    matrix[np.array([not c for c in folder_cores])] = 0.0
+    matrix[:, np.array([not c for c in video_cores])] = 0.0
+    return matrix
+
+def find_best_video_match(folder: Union[str, FolderKey], video_index: List[VideoEntry], threshold: float = 0.7,
+                          ratios=None, candidates: Optional[List[int]] = None,
+                          scorer: str = 'ratio') -> Tuple[Optional[str], float]:
+    """
+    Try to find best video path from the video_index for folder (a name or prep_folder() result).
+    ratios, if given, are the precomputed direct similarities against each video_index entry
+    (in order), i.e. one row of batch_similarity(). Otherwise only the video_index positions
+    in candidates (see candidate_indices) are scored, or every entry when it is None.
+    scorer picks the direct-similarity measure (see SCORERS).
+    """
+    if not isinstance(folder, FolderKey):
+        folder = prep_folder(folder)
+    folder_core = folder.core
     best_match = None
     best_score = 0.0
 
-    for filename, full_path in video_index.items():
-        video_core = extract_core_name(filename)
-        # Strategy 1: Direct similarity
-        score1 = similarity_score(folder_core, video_core)
-
-        # Strategy 2: containment boost
-        contains_score = 0.0
-        if folder_core and video_core:
-            if folder_core in video_core or video_core in folder_core:
-                contains_score = 0.8
-
-        # Strategy 3: word overlap
-        folder_words = set(folder_core.split())
-        video_words = set(video_core.split())
-        word_overlap = 0.0
-        if folder_words and video_words:
-            word_overlap = len(folder_words.intersection(video_words)) / len(folder_words.union(video_words))
-
-        total = (score1 * 0.5) + (contains_score * 0.3) + (word_overlap * 0.2)
+    if ratios is not None:
+        # Visit videos by descending direct ratio and stop as soon as even the full
+        # containment/overlap boost can't lift one past the threshold or the best so far.
+        for i in np.argsort(-ratios, kind='stable'):
+            score1 = float(ratios[i])
+            upper = (score1 * 0.5) + MAX_BOOST
+            if upper < threshold or upper <= best_score:
+                break
+            video = video_index[i]
+            total = weighted_score(folder, video, score1)
+            if total > best_score and total >= threshold:
+                best_score = total
+                best_match = video.path
+        return best_match, best_score
+
+    entries = video_index
+    if candidates is not None:
+        entries = [video_index[i] for i in candidates]
+
+    # Branch and bound: visit videos by their length-based ceiling, best first, and stop once
+    # that ceiling (plus the full boost) can't reach the threshold or beat the best so far.
+    folder_len = len(folder_core)
+    bounds = [length_upper_bound(folder_len, len(video.core), scorer) for video in entries]
+    for i in sorted(range(len(entries)), key=bounds.__getitem__, reverse=True):
+        upper = (bounds[i] * 0.5) + MAX_BOOST
+        if upper < threshold or upper <= best_score:
+            break
+        video = entries[i]
+        # Strategy 1: Direct similarity. Anything below this cutoff can't beat the
+        # current best (or the threshold) even with the full containment/overlap boost.
+        cutoff = (max(best_score, threshold) - MAX_BOOST) / 0.5
+        score1 = similarity_score(folder_core, video.core, score_cutoff=cutoff, scorer=scorer)
+
+        total = weighted_score(folder, video, score1)
         if total > best_score and total >= threshold:
             best_score = total
-            best_match = full_path
+            best_match = video.path
 
     return best_match, best_score
 
-def find_videos_by_content_similarity(folder_name: str, video_index: Dict[str, str], low_threshold: float = 0.6) -> Tuple[Optional[str], float]:
+def find_videos_by_content_similarity(folder: Union[str, FolderKey], video_index: List[VideoEntry], low_threshold: float = 0.6) -> Tuple[Optional[str], float]:
     """Alternative matching (no-space, basic cleaning). Returns best candidate if above low_threshold."""
-    folder_base = folder_name.replace('.gifs', '')
-    # basic cleaning
-    clean_folder = re.sub(r'[^\w\s]', ' ', folder_base).lower()
-    clean_folder = re.sub(r'\s+', ' ', clean_folder).strip()
+    if not isinstance(folder, FolderKey):
+        folder = prep_folder(folder)
+    clean_folder = folder.clean
+    folder_no_space = folder.clean_nospace
+    folder_words = folder.clean_tokens
 
     candidates = []
-    for filename, full_path in video_index.items():
-        video_base = os.path.splitext(filename)[0]
-        clean_video = re.sub(r'[\[\(].*?[\]\)]', ' ', video_base)
-        clean_video = re.sub(r'[^\w\s]', ' ', clean_video).lower()
-        clean_video = re.sub(r'\s+', ' ', clean_video).strip()
-
-        sim_direct = similarity_score(clean_folder, clean_video)
-        sim_no_space = similarity_score(re.sub(r'\s+', '', clean_folder), re.sub(r'\s+', '', clean_video))
-        folder_words = set(clean_folder.split())
-        video_words = set(clean_video.split())
+    for video in video_index:
+        clean_video = video.clean
+        video_no_space = video.clean_nospace
+        video_words = video.clean_tokens
+
+        # Skip videos that no strategy could score high enough, judging by lengths alone
+        # (word similarity is at most min/max of the two word counts).
+        word_counts = (len(folder_words), len(video_words))
+        word_bound = min(word_counts) / max(word_counts) if min(word_counts) else 0.0
+        if (length_upper_bound(len(clean_folder), len(clean_video)) < low_threshold
+                and length_upper_bound(len(folder_no_space), len(video_no_space)) < low_threshold
+                and word_bound < low_threshold):
+            continue
+
+        sim_direct = similarity_score(clean_folder, clean_video, score_cutoff=low_threshold)
+        # Joined-up names are long strings over a small alphabet, where a full Ratcliff-Obershelp
+        # match is slowest; the cutoff lets rapidfuzz stop its bit-parallel LCS (and difflib
+        # its quick_ratio check) as soon as low_threshold is out of reach
+        sim_no_space = similarity_score(folder_no_space, video_no_space, score_cutoff=low_threshold)
         word_similarity = 0.0
         if folder_words and video_words:
-            common = folder_words.intersection(video_words)
-            word_similarity = len(common) / max(len(folder_words), len(video_words))
+            word_similarity = len(folder_words & video_words) / max(len(folder_words), len(video_words))
 
         combined = max(sim_direct, sim_no_space, word_similarity)
         if combined >= low_threshold:
-            candidates.append((combined, full_path))
+            candidates.append((combined, video.path))
 
     if not candidates:
         return None, 0.0
     candidates.sort(reverse=True, key=lambda x: x[0])
     return candidates[0][1], candidates[0][0]
 
+def match_folder(folder: FolderKey, video_index: List[VideoEntry], threshold: float,
+                 ratios=None, candidates: Optional[List[int]] = None,
+                 scorer: str = 'ratio') -> Tuple[Optional[str], float]:
+    """
+    Match one .gifs folder: the weighted primary matcher first, then the content-similarity
+    fallback (at threshold - 0.05) only if that found nothing. Returns (video_path, score).
+    """
+    video_file, score = find_best_video_match(folder, video_index, threshold=threshold,
+                                              ratios=ratios, candidates=candidates, scorer=scorer)
+    if not video_file:
+        video_file, score = find_videos_by_content_similarity(folder, video_index, low_threshold=threshold - 0.05)
+    return video_file, score
+
 # ---------------------------
 # Main logic: find pairs and delete
 # ---------------------------
-def gather_pairs(target_directory: str, downloads_directory: str, threshold: float) -> List[Dict]:
+def gather_pairs(target_directory: str, downloads_directory: str, threshold: float,
+                 scorer: str = 'ratio', workers: Optional[int] = None) -> List[Dict]:
     """
     Return a list of dicts:
     { 'folder': name, 'folder_path': ..., 'video_file': ..., 'video_name': ..., 'score': ... }
+    Folders are matched in `workers` processes. The default is one per CPU without
+    rapidfuzz, and 1 with it, since its batch scorer already runs on every core. On Windows
+    the count is capped at WINDOWS_MAX_WORKERS.
     """
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
     pairs = []
-    video_index = index_videos(downloads_directory)
     if not os.path.isdir(target_directory):
         logging.warning("Target directory does not exist: %s", target_directory)
         return pairs
 
     try:
-        for item in os.listdir(target_directory):
+        # The two directories are often on different drives; list them at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            folders_future = executor.submit(list_gifs_folders, target_directory)
+            videos_future = executor.submit(index_videos, downloads_directory)
+            gifs_folders = folders_future.result()
+            video_index = videos_future.result()
+
+        # Normalise every folder name once, up front, for the batch and both matchers
+        folder_keys = [prep_folder(f) for f in gifs_folders]
+        folder_cores = [k.core for k in folder_keys]
+        video_cores = [v.core for v in video_index]
+        # Score every folder against every video in one batch (None without rapidfuzz)
+        ratio_matrix = batch_similarity(folder_cores, video_cores, score_cutoff=(threshold - MAX_BOOST) / 0.5,
+                                        scorer=scorer)
+        # Without the batch, shortlist videos per folder through a bigram index instead
+        # (only where the shortlist is exact; see BIGRAM_SHORTLIST_MIN_THRESHOLD)
+        use_shortlist = ratio_matrix is None and threshold >= BIGRAM_SHORTLIST_MIN_THRESHOLD
+        posting = build_bigram_index(video_cores) if use_shortlist else None
+
+        if ratio_matrix is not None:
+            # One vectorised pass over the matrix finds the folders whose best direct ratio,
+            # even with the full boost, can't reach the threshold. The primary matcher has
+            # nothing to do for those, so they get an empty candidate list and go straight
+            # to the fallback; only the kept rows are walked in Python.
+            best = ratio_matrix.max(axis=1)
+            keep = (best * 0.5) + MAX_BOOST >= threshold
+            ratio_rows = [row if k else None for row, k in zip(ratio_matrix, keep)]
+            candidate_lists = [None if k else [] for k in keep]
+        else:
+            ratio_rows = [None] * len(gifs_folders)
+            candidate_lists = ([candidate_indices(core, posting) for core in folder_cores]
+                               if posting is not None else [None] * len(gifs_folders))
+
+        # Folders match independently, so spread them over processes (threads would just
+        # queue on the GIL: the per-folder work is Python plus short, GIL-holding scorer calls)
+        if workers is None:
+            workers = 1 if ratio_matrix is not None else (os.cpu_count() or 1)
+        if sys.platform == 'win32':
+            workers = min(workers, WINDOWS_MAX_WORKERS)
+        task_args = (folder_keys, repeat(video_index), repeat(threshold),
+                     ratio_rows, candidate_lists, repeat(scorer))
+        if workers > 1 and len(gifs_folders) > 1:
+            # Big chunks, so the shared video_index is pickled once per chunk, not per folder
+            chunksize = max(1, len(gifs_folders) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                matches = list(executor.map(match_folder, *task_args, chunksize=chunksize))
+        else:
+            matches = list(map(match_folder, *task_args))
+
+        for item, (video_file, score) in zip(gifs_folders, matches):
             item_path = os.path.join(target_directory, item)
-            # Only directories that end with .gifs
-            if os.path.isdir(item_path) and item.lower().endswith('.gifs'):
-                # Try primary method
-                video_file, score = find_best_video_match(item, video_index, threshold=threshold)
-                # fallback
-                if not video_file:
-                    video_file, score = find_videos_by_content_similarity(item, video_index, low_threshold=threshold - 0.05)
-                if video_file and os.path.exists(video_file):
-                    pairs.append({
-                        'folder': item,
-                        'folder_path': item_path,
-                        'video_file': video_file,
-                        'video_name': os.path.basename(video_file),
-                        'score': score
-                    })
+            if video_file:
+                pairs.append({
+                    'folder': item,
+                    'folder_path': item_path,
+                    'video_file': video_file,
+                    'video_name': os.path.basename(video_file),
+                    'score': score
+                })
     except Exception as exc:
         logging.exception("Error while scanning target directory: %s", exc)
     return pairs
@@ -249,16 +573,15 @@ def perform_deletion(pairs: List[Dict], dry_run: bool = True, use_trash: bool =
 # ---------------------------
 # Debug / preview
 # ---------------------------
-def debug_matching(folder_name: str, downloads_directory: str, debug_limit: int = 10):
+def debug_matching(folder_name: str, downloads_directory: str, debug_limit: int = 10, scorer: str = 'ratio'):
     """Print debug info for a single folder using the current index."""
     index = index_videos(downloads_directory)
     fc = extract_core_name(folder_name)
     print(f"\nDEBUG: folder='{folder_name}' -> core='{fc}'")
-    for filename in list(index.keys())[:debug_limit]:
-        vc = extract_core_name(filename)
-        sc = similarity_score(fc, vc)
+    for video in index[:debug_limit]:
+        sc = similarity_score(fc, video.core, scorer=scorer)
         if sc > 0.2:
-            print(f"  candidate: '{filename}' core='{vc}' score={sc:.2f}")
+            print(f"  candidate: '{video.name}' core='{video.core}' score={sc:.2f}")
 
 # ---------------------------
 # CLI
@@ -268,6 +591,10 @@ def parse_args():
     parser.add_argument('--target', '-t', default=r"C:\Users\harip\ALL TEST", help="Target directory to scan for .gifs folders")
     parser.add_argument('--downloads', '-d', default=r"D:\downloads", help="Directory containing video files")
     parser.add_argument('--threshold', type=float, default=0.65, help="Similarity threshold (0-1) for a match to count")
+    parser.add_argument('--scorer', choices=SCORERS, default='ratio',
+                        help="Direct similarity measure; jaro-winkler needs rapidfuzz and scores higher, so raise --threshold with it")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Processes used to match folders (default: one per CPU without rapidfuzz, otherwise 1)")
     parser.add_argument('--dry-run', action='store_true', help="Preview only; do not delete anything")
     parser.add_argument('--yes', action='store_true', help="Skip interactive confirmation")
     parser.add_argument('--no-trash', action='store_true', help="Do not use send2trash even if available; delete permanently")
@@ -299,17 +626,28 @@ def main():
         print(f"Downloads directory not found: {args.downloads}")
         return
 
-    pairs = gather_pairs(args.target, args.downloads, threshold=args.threshold)
+    if args.scorer == 'jaro-winkler' and not RAPIDFUZZ_AVAILABLE:
+        logging.error("The jaro-winkler scorer requires rapidfuzz")
+        print("The jaro-winkler scorer requires rapidfuzz (pip install rapidfuzz)")
+        return
+
+    if args.workers is not None and args.workers < 1:
+        logging.error("Invalid --workers value: %d", args.workers)
+        print(f"--workers must be at least 1 (got {args.workers})")
+        return
+
+    pairs = gather_pairs(args.target, args.downloads, threshold=args.threshold, scorer=args.scorer,
+                         workers=args.workers)
 
     if not pairs:
         print("❌ No matching pairs found with current thresholds.")
         logging.info("No matching pairs found.")
         # Optionally show debug for up to 3 folders
-        sample_folders = [f for f in os.listdir(args.target) if os.path.isdir(os.path.join(args.target, f)) and f.lower().endswith('.gifs')][:3]
+        sample_folders = list_gifs_folders(args.target)[:3]
         if sample_folders:
             print("\n💡 Running debug on up to first 3 .gifs folders:")
             for f in sample_folders:
-                debug_matching(f, args.downloads)
+                debug_matching(f, args.downloads, scorer=args.scorer)
         return
 
     print(f"\n🎯 WOULD DELETE ({len(pairs)} pairs):")